@@ -1,9 +1,66 @@
 import os
 import logging
-from typing import Dict, List, Optional, Any
-from pymongo import MongoClient, errors
+from typing import Dict, Iterator, List, Optional, Any, Tuple, Type
+from pymongo import MongoClient, UpdateOne, errors
+from pymongo.collation import Collation
 from pymongo.collection import Collection
 from pymongo.database import Database
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection, AsyncIOMotorDatabase
+
+# Client options shared by the sync and async connectors: a small warm
+# connection pool and compressed wire traffic (zlib is the always-available
+# fallback when zstandard is not installed)
+_CLIENT_OPTIONS = {
+    'maxPoolSize': 16,
+    'minPoolSize': 4,
+    'w': 1,
+    'retryWrites': True,
+    'compressors': 'zstd,zlib',
+}
+
+# Case-insensitive comparison; queries must pass the same collation as an
+# index for that index to be used
+CASE_INSENSITIVE = Collation(locale='en', strength=2)
+
+# Clients shared per (client class, URI) within a process, so the sync and
+# async connectors each keep one pool per URI, and how many connectors
+# currently hold each one
+_CLIENTS: Dict[Tuple[Type, str], Any] = {}
+_CLIENT_REFS: Dict[Tuple[Type, str], int] = {}
+
+
+def _acquire_client(client_cls: Type, uri: str) -> Any:
+    """Return the shared client_cls client for uri, creating it on first use."""
+    key = (client_cls, uri)
+    if key not in _CLIENTS:
+        _CLIENTS[key] = client_cls(uri, **_CLIENT_OPTIONS)
+        _CLIENT_REFS[key] = 0
+    _CLIENT_REFS[key] += 1
+    return _CLIENTS[key]
+
+
+def _release_client(client_cls: Type, uri: str) -> None:
+    """Drop one reference to a shared client, closing it after the last."""
+    key = (client_cls, uri)
+    if key not in _CLIENTS:
+        return
+    _CLIENT_REFS[key] -= 1
+    if _CLIENT_REFS[key] <= 0:
+        _CLIENT_REFS.pop(key)
+        _CLIENTS.pop(key).close()
+
+
+def _upsert_operations(documents: List[Dict], unique_keys: List[str]) -> List[UpdateOne]:
+    """Build insert-if-missing upserts matching documents on unique_keys."""
+    return [
+        UpdateOne(
+            {key: doc.get(key) for key in unique_keys},
+            {'$setOnInsert': doc},
+            upsert=True
+        )
+        for doc in documents
+    ]
+
 
 class MongoDBConnector:
     """
@@ -34,7 +91,10 @@ class MongoDBConnector:
             bool: True if connection is successful, False otherwise
         """
         try:
-            self.client = MongoClient(self.mongo_uri)
+            # Reuse the process-wide client for this URI so its connection
+            # pool is shared between connectors
+            if self.client is None:
+                self.client = _acquire_client(MongoClient, self.mongo_uri)
             # Force connection to verify it works
             self.client.admin.command('ping')
             self.db = self.client[self.db_name]
@@ -42,12 +102,20 @@ class MongoDBConnector:
             return True
         except errors.ConnectionFailure as e:
             self.logger.error(f"Failed to connect to MongoDB: {e}")
+            self.close()
             return False
     
     def close(self) -> None:
-        """Close the MongoDB connection."""
+        """
+        Close the MongoDB connection.
+        
+        The shared client for this URI is only closed once every connector
+        using it has been closed.
+        """
         if self.client:
-            self.client.close()
+            _release_client(MongoClient, self.mongo_uri)
+            self.client = None
+            self.db = None
             self.logger.info("MongoDB connection closed")
     
     def get_collection(self, collection_name: str) -> Optional[Collection]:
@@ -65,14 +133,15 @@ class MongoDBConnector:
                 return None
         return self.db[collection_name]
         
-    def insert_one(self, collection_name: str, document: Dict, unique_keys: Optional[List[str]] = None) -> Optional[str]:
+    def insert_one(self, collection_name: str, document: Dict) -> Optional[str]:
         """
-        Insert a single document into MongoDB with duplicate handling.
+        Insert a single document into MongoDB.
+        
+        Any unique indexes should be created once up front by the caller.
 
         Args:
             collection_name: Name of the target collection
             document: Dictionary to insert
-            unique_keys: List of keys to create a unique index on
             
         Returns:
             str: Inserted document ID or None if failed
@@ -81,17 +150,7 @@ class MongoDBConnector:
             return None
             
         try:
-            # Create unique index if unique_keys specified
-            collection = self.db[collection_name]
-            if unique_keys:
-                index_dict = {key: 1 for key in unique_keys}
-                try:
-                    collection.create_index(index_dict, unique=True)
-                except Exception as e:
-                    self.logger.warning(f"Could not create unique index: {e}")
-            
-            # Insert the document
-            result = collection.insert_one(document)
+            result = self.db[collection_name].insert_one(document)
             return str(result.inserted_id)
         except Exception as e:
             self.logger.error(f"Error inserting document: {e}")
@@ -130,6 +189,40 @@ class MongoDBConnector:
             self.logger.error(f"Error inserting documents: {e}")
             return 0
     
+    def bulk_upsert(self, collection_name: str, documents: List[Dict], unique_keys: List[str]) -> int:
+        """
+        Upsert multiple documents in a single bulk write.
+        
+        Documents are matched on unique_keys and only written if no
+        matching document exists yet, so existing records are left untouched.
+        
+        Args:
+            collection_name: Name of the target collection
+            documents: List of dictionaries to upsert
+            unique_keys: Keys identifying a document
+            
+        Returns:
+            int: Number of new documents inserted
+        """
+        if not documents:
+            return 0
+            
+        collection = self.get_collection(collection_name)
+        if collection is None:
+            self.logger.error(f"Cannot upsert {len(documents)} documents: not connected to MongoDB")
+            return 0
+            
+        try:
+            result = collection.bulk_write(_upsert_operations(documents, unique_keys), ordered=False)
+            self.logger.info(f"Upserted {result.upserted_count} of {len(documents)} documents")
+            return result.upserted_count
+        except errors.BulkWriteError as e:
+            self.logger.warning(f"Bulk write error: {e.details}")
+            return e.details.get('nUpserted', 0)
+        except Exception as e:
+            self.logger.error(f"Error upserting documents: {e}")
+            return 0
+    
     def find(self, collection_name: str, query: Dict = None, projection: Dict = None, 
          limit: int = 0) -> List[Dict]:
         """
@@ -159,6 +252,30 @@ class MongoDBConnector:
             self.logger.error(f"Error finding documents: {e}")
             return []
     
+    def iter_aggregate(self, collection_name: str, pipeline: List[Dict],
+                       batch_size: int = 1000, collation: Optional[Collation] = None) -> Iterator[Dict]:
+        """
+        Lazily yield the results of an aggregation pipeline.
+        
+        Args:
+            collection_name: Name of the collection
+            pipeline: List of aggregation stages
+            batch_size: Number of documents fetched per round trip
+            collation: Collation for string comparisons (e.g. CASE_INSENSITIVE)
+            
+        Yields:
+            Documents output by the pipeline
+            
+        Raises:
+            PyMongoError: If the aggregation fails, including partway through
+            iteration, so callers can tell a truncated result from a full one
+        """
+        collection = self.get_collection(collection_name)
+        if collection is None:
+            return
+            
+        yield from collection.aggregate(pipeline, batchSize=batch_size, collation=collation)
+    
     def count_documents(self, collection_name: str, query: Dict = None) -> int:
         """
         Count documents matching the query.
@@ -178,4 +295,133 @@ class MongoDBConnector:
             return collection.count_documents(query or {})
         except Exception as e:
             self.logger.error(f"Error counting documents: {e}")
-            return 0
\ No newline at end of file
+            return 0
+
+
+class AsyncMongoDBConnector:
+    """
+    An asyncio connector class to handle MongoDB operations using motor.
+    
+    Mirrors MongoDBConnector for callers running on an event loop, such as
+    the Scrapy item pipelines.
+    """
+    def __init__(self, uri: Optional[str] = None, db_name: Optional[str] = None):
+        """
+        Initialize MongoDB connection.
+        
+        Args:
+            uri: MongoDB connection URI (defaults to environment variable)
+            db_name: Database name (defaults to environment variable)
+        """
+        self.logger = logging.getLogger(__name__)
+        
+        # Get connection parameters from environment variables if not provided
+        self.mongo_uri = uri or os.environ.get('MONGO_URI', 'mongodb://localhost:27017/')
+        self.db_name = db_name or os.environ.get('MONGO_DATABASE', 'jobs_data')
+        
+        self.client: Optional[AsyncIOMotorClient] = None
+        self.db: Optional[AsyncIOMotorDatabase] = None
+        
+    async def connect(self) -> bool:
+        """
+        Establish connection to MongoDB.
+        
+        Returns:
+            bool: True if connection is successful, False otherwise
+        """
+        try:
+            # Reuse the process-wide client for this URI so its connection
+            # pool is shared between connectors
+            if self.client is None:
+                self.client = _acquire_client(AsyncIOMotorClient, self.mongo_uri)
+            # Force connection to verify it works
+            await self.client.admin.command('ping')
+            self.db = self.client[self.db_name]
+            self.logger.info(f"Connected to MongoDB at {self.mongo_uri}, database: {self.db_name}")
+            return True
+        except errors.ConnectionFailure as e:
+            self.logger.error(f"Failed to connect to MongoDB: {e}")
+            self.close()
+            return False
+    
+    def close(self) -> None:
+        """
+        Close the MongoDB connection.
+        
+        The shared client for this URI is only closed once every connector
+        using it has been closed.
+        """
+        if self.client:
+            _release_client(AsyncIOMotorClient, self.mongo_uri)
+            self.client = None
+            self.db = None
+            self.logger.info("MongoDB connection closed")
+    
+    def get_collection(self, collection_name: str) -> Optional[AsyncIOMotorCollection]:
+        """
+        Get a MongoDB collection.
+        
+        Args:
+            collection_name: Name of the collection
+            
+        Returns:
+            Collection object or None if not connected
+        """
+        if self.db is None:
+            return None
+        return self.db[collection_name]
+    
+    async def insert_one(self, collection_name: str, document: Dict) -> Optional[str]:
+        """
+        Insert a single document into MongoDB.
+        
+        Args:
+            collection_name: Name of the target collection
+            document: Dictionary to insert
+            
+        Returns:
+            str: Inserted document ID or None if failed
+        """
+        collection = self.get_collection(collection_name)
+        if collection is None:
+            return None
+            
+        try:
+            result = await collection.insert_one(document)
+            return str(result.inserted_id)
+        except Exception as e:
+            self.logger.error(f"Error inserting document: {e}")
+            return None
+    
+    async def bulk_upsert(self, collection_name: str, documents: List[Dict],
+                          unique_keys: List[str]) -> Optional[int]:
+        """
+        Upsert multiple documents in a single bulk write.
+        
+        Args:
+            collection_name: Name of the target collection
+            documents: List of dictionaries to upsert
+            unique_keys: Keys identifying a document
+            
+        Returns:
+            Optional[int]: Number of new documents inserted, or None if the
+            documents could not be written
+        """
+        if not documents:
+            return 0
+            
+        collection = self.get_collection(collection_name)
+        if collection is None:
+            self.logger.error(f"Cannot upsert {len(documents)} documents: not connected to MongoDB")
+            return None
+            
+        try:
+            result = await collection.bulk_write(_upsert_operations(documents, unique_keys), ordered=False)
+            self.logger.info(f"Upserted {result.upserted_count} of {len(documents)} documents")
+            return result.upserted_count
+        except errors.BulkWriteError as e:
+            self.logger.warning(f"Bulk write error: {e.details}")
+            return e.details.get('nUpserted', 0)
+        except Exception as e:
+            self.logger.error(f"Error upserting documents: {e}")
+            return None
@@ -1,26 +1,55 @@
 import os
 import logging
-from typing import Optional
+from typing import List, Optional, Tuple
 import redis
-from redis.exceptions import ConnectionError, RedisError
+import redis.asyncio
+from redis.exceptions import ConnectionError, NoScriptError, RedisError
+from redis.utils import HIREDIS_AVAILABLE
+
+# redis-py picks the C hiredis reply parser automatically when it is installed
+_PARSER_NAME = 'hiredis' if HIREDIS_AVAILABLE else 'pure-Python'
+
+# Adds ARGV[1] to the set KEYS[1] and, only if it was new, records the
+# timestamp ARGV[2] for it in the hash KEYS[2]; returns 1 if new, 0 otherwise
+_MARK_SEEN_LUA = """
+if redis.call('SADD', KEYS[1], ARGV[1]) == 1 then
+    redis.call('HSET', KEYS[2], ARGV[1], ARGV[2])
+    return 1
+end
+return 0
+"""
+
 
 class RedisConnector:
     """
     A connector class to handle Redis operations for caching and deduplication.
     """
-    def __init__(self, url: Optional[str] = None):
+    def __init__(self, url: Optional[str] = None, pool_size: Optional[int] = None):
         """
         Initialize Redis connection.
         
         Args:
             url: Redis connection URL (defaults to environment variable)
+            pool_size: Maximum pooled connections (defaults to environment variable)
         """
         self.logger = logging.getLogger(__name__)
         
-        # Get connection URL from environment variable if not provided
+        # Get connection parameters from environment variables if not provided
         self.redis_url = url or os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+        self.pool_size = pool_size or int(os.environ.get('REDIS_POOL_SIZE', '8'))
         
-        self.client: Optional[redis.Redis] = None
+        self._client: Optional[redis.Redis] = None
+    
+    @property
+    def client(self) -> Optional[redis.Redis]:
+        """
+        Underlying redis-py client, connecting on first access.
+        
+        Useful for callers that need raw commands such as pipelines.
+        """
+        if self._client is None:
+            self.connect()
+        return self._client
         
     def connect(self) -> bool:
         """
@@ -30,10 +59,18 @@ class RedisConnector:
             bool: True if connection is successful, False otherwise
         """
         try:
-            self.client = redis.from_url(self.redis_url)
+            # Small bounded pool: callers wait for a free connection rather
+            # than opening an unbounded number of sockets
+            pool = redis.BlockingConnectionPool.from_url(
+                self.redis_url,
+                max_connections=self.pool_size,
+                timeout=5,
+                socket_keepalive=True
+            )
+            self._client = redis.Redis.from_pool(pool)
             # Test connection
-            self.client.ping()
-            self.logger.info(f"Connected to Redis at {self.redis_url}")
+            self._client.ping()
+            self.logger.info(f"Connected to Redis at {self.redis_url} ({_PARSER_NAME} parser)")
             return True
         except ConnectionError as e:
             self.logger.error(f"Failed to connect to Redis: {e}")
@@ -44,8 +81,8 @@ class RedisConnector:
     
     def close(self) -> None:
         """Close the Redis connection."""
-        if self.client:
-            self.client.close()
+        if self._client:
+            self._client.close()
             self.logger.info("Redis connection closed")
     
     def add_to_set(self, set_name: str, value: str) -> bool:
@@ -59,11 +96,11 @@ class RedisConnector:
         Returns:
             bool: True if value was added, False if already exists or error
         """
-        if not self.client and not self.connect():
+        if not self._client and not self.connect():
             return False
             
         try:
-            return bool(self.client.sadd(set_name, value))
+            return bool(self._client.sadd(set_name, value))
         except RedisError as e:
             self.logger.error(f"Error adding to set: {e}")
             return False
@@ -79,11 +116,11 @@ class RedisConnector:
         Returns:
             bool: True if value is in set, False otherwise
         """
-        if not self.client and not self.connect():
+        if not self._client and not self.connect():
             return False
             
         try:
-            return bool(self.client.sismember(set_name, value))
+            return bool(self._client.sismember(set_name, value))
         except RedisError as e:
             self.logger.error(f"Error checking set membership: {e}")
             return False
@@ -114,4 +151,193 @@ class RedisConnector:
             bool: True if job ID was seen before, False otherwise
         """
         dedupe_set = f"scraped_jobs:{source}"
-        return self.is_in_set(dedupe_set, job_id)
\ No newline at end of file
+        return self.is_in_set(dedupe_set, job_id)
+
+
+class AsyncRedisConnector:
+    """
+    An asyncio connector class to handle Redis deduplication using redis.asyncio.
+    
+    Mirrors RedisConnector for callers running on an event loop, such as
+    the Scrapy item pipelines.
+    """
+    def __init__(self, url: Optional[str] = None, pool_size: Optional[int] = None):
+        """
+        Initialize Redis connection.
+        
+        Args:
+            url: Redis connection URL (defaults to environment variable)
+            pool_size: Maximum pooled connections (defaults to environment variable)
+        """
+        self.logger = logging.getLogger(__name__)
+        
+        # Get connection parameters from environment variables if not provided
+        self.redis_url = url or os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+        self.pool_size = pool_size or int(os.environ.get('REDIS_POOL_SIZE', '8'))
+        
+        self._client: Optional[redis.asyncio.Redis] = None
+        self._mark_seen_sha: Optional[str] = None
+    
+    @property
+    def client(self) -> Optional[redis.asyncio.Redis]:
+        """Underlying redis.asyncio client, or None before connect() is awaited."""
+        return self._client
+        
+    async def connect(self) -> bool:
+        """
+        Establish connection to Redis.
+        
+        Returns:
+            bool: True if connection is successful, False otherwise
+        """
+        try:
+            # Bounded pool; not the asyncio BlockingConnectionPool, which in
+            # redis 5.0.x deadlocks on a failed connect and leaks the slot,
+            # leaving the pool unusable after a brief outage
+            pool = redis.asyncio.ConnectionPool.from_url(
+                self.redis_url,
+                max_connections=self.pool_size,
+                socket_keepalive=True
+            )
+            self._client = redis.asyncio.Redis.from_pool(pool)
+            # Test connection
+            await self._client.ping()
+            self.logger.info(f"Connected to Redis at {self.redis_url} ({_PARSER_NAME} parser)")
+            return True
+        except ConnectionError as e:
+            self.logger.error(f"Failed to connect to Redis: {e}")
+            return False
+        except Exception as e:
+            self.logger.error(f"Unexpected error connecting to Redis: {e}")
+            return False
+    
+    async def close(self) -> None:
+        """Close the Redis connection."""
+        if self._client:
+            await self._client.aclose()
+            self.logger.info("Redis connection closed")
+    
+    async def add_to_set(self, set_name: str, value: str) -> bool:
+        """
+        Add a value to a Redis set (useful for deduplication).
+        
+        Args:
+            set_name: Name of the set
+            value: Value to add
+            
+        Returns:
+            bool: True if value was added, False if already exists or error
+        """
+        if not self._client and not await self.connect():
+            return False
+            
+        try:
+            return bool(await self._client.sadd(set_name, value))
+        except RedisError as e:
+            self.logger.error(f"Error adding to set: {e}")
+            return False
+    
+    async def is_in_set(self, set_name: str, value: str) -> bool:
+        """
+        Check if a value exists in a Redis set.
+        
+        Args:
+            set_name: Name of the set
+            value: Value to check
+            
+        Returns:
+            bool: True if value is in set, False otherwise
+        """
+        if not self._client and not await self.connect():
+            return False
+            
+        try:
+            return bool(await self._client.sismember(set_name, value))
+        except RedisError as e:
+            self.logger.error(f"Error checking set membership: {e}")
+            return False
+    
+    async def load_scripts(self) -> bool:
+        """
+        Upload the Lua scripts used by this connector to the script cache.
+        
+        Returns:
+            bool: True if the scripts were loaded, False otherwise
+        """
+        if not self._client and not await self.connect():
+            return False
+            
+        try:
+            self._mark_seen_sha = await self._client.script_load(_MARK_SEEN_LUA)
+            return True
+        except RedisError as e:
+            self.logger.error(f"Error loading Lua scripts: {e}")
+            return False
+    
+    async def mark_seen(self, set_name: str, value: str, timestamp: int) -> Optional[bool]:
+        """
+        Atomically add a value to a set and record when it was first seen.
+        
+        The first-seen timestamps are kept in the hash "seen_ts:<set_name>".
+        Both steps run server-side in a single EVALSHA round trip.
+        
+        Args:
+            set_name: Name of the set
+            value: Value to add
+            timestamp: Unix timestamp to record if the value is new
+            
+        Returns:
+            Optional[bool]: True if value was added, False if it already
+            existed, None if Redis could not be reached or returned an error
+        """
+        if self._mark_seen_sha is None and not await self.load_scripts():
+            return None
+            
+        keys_and_args = (set_name, f"seen_ts:{set_name}", value, timestamp)
+        try:
+            try:
+                return bool(await self._client.evalsha(self._mark_seen_sha, 2, *keys_and_args))
+            except NoScriptError:
+                # Script cache was flushed (e.g. Redis restarted), so reload it
+                if not await self.load_scripts():
+                    return None
+                return bool(await self._client.evalsha(self._mark_seen_sha, 2, *keys_and_args))
+        except RedisError as e:
+            self.logger.error(f"Error marking value as seen: {e}")
+            return None
+    
+    async def mark_seen_many(self, members: List[Tuple[str, str]], timestamp: int) -> Optional[List[bool]]:
+        """
+        Run mark_seen for many (set_name, value) pairs in one pipelined round trip.
+        
+        Args:
+            members: (set_name, value) pairs to mark
+            timestamp: Unix timestamp to record for new values
+            
+        Returns:
+            Optional[List[bool]]: For each pair, True if the value was added,
+            False if it already existed; None if Redis could not be reached
+            or returned an error
+        """
+        if not members:
+            return []
+        if self._mark_seen_sha is None and not await self.load_scripts():
+            return None
+            
+        async def run() -> List[bool]:
+            pipe = self._client.pipeline(transaction=False)
+            for set_name, value in members:
+                pipe.evalsha(self._mark_seen_sha, 2, set_name, f"seen_ts:{set_name}", value, timestamp)
+            return [bool(result) for result in await pipe.execute()]
+        
+        try:
+            try:
+                return await run()
+            except NoScriptError:
+                # Script cache was flushed (e.g. Redis restarted), so reload it
+                if not await self.load_scripts():
+                    return None
+                return await run()
+        except RedisError as e:
+            self.logger.error(f"Error marking values as seen: {e}")
+            return None
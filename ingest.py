@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Ingest script for loading local job JSON files straight into MongoDB.
+
+This script:
+1. Finds the JSON files in the data directory
+2. Parses and cleans each file in its own worker process, reusing the
+   spider's field mapping and the cleaning pipeline
+3. Bulk upserts each file's jobs into MongoDB on (job_id, source)
+
+It bypasses Scrapy and Redis entirely, which makes it the faster option for
+large local ingests where parsing and cleaning are CPU-bound.
+"""
+
+import os
+import sys
+import logging
+import argparse
+from multiprocessing import Pool
+from typing import List
+
+import orjson
+
+# Make the Scrapy project package importable when run from the project root
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'job_project'))
+
+# Import our infrastructure connectors and the Scrapy project's processing code
+from infra.mongodb_connector import MongoDBConnector
+from job_project.pipelines import JobDataCleaningPipeline, JobsMongoDBPipeline
+from job_project.spiders.spiders import JobSpider
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
+    handlers=[logging.StreamHandler()]
+)
+
+logger = logging.getLogger('ingest')
+
+# Each worker process's MongoDB connector, opened once by init_worker and
+# reused for every file that worker handles
+_worker_connector = None
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='Ingest local job JSON files into MongoDB')
+
+    parser.add_argument('--data-dir', type=str,
+                        default=os.path.join(PROJECT_ROOT, 'job_project', 'data'),
+                        help='Directory containing the JSON files')
+
+    parser.add_argument('--workers', type=int, default=0,
+                        help='Number of worker processes (0 for one per file, up to the CPU count)')
+
+    parser.add_argument('--mongo-uri', type=str,
+                        default=os.environ.get('MONGO_URI', 'mongodb://mongodb:27017/'),
+                        help='MongoDB connection URI')
+
+    parser.add_argument('--mongo-db', type=str,
+                        default=os.environ.get('MONGO_DATABASE', 'jobs_data'),
+                        help='MongoDB database name')
+
+    return parser.parse_args()
+
+
+def find_files(data_dir: str) -> List[str]:
+    """
+    List the JSON files in the data directory.
+
+    Args:
+        data_dir: Directory to search
+
+    Returns:
+        List[str]: Sorted paths of JSON files
+    """
+    return sorted(
+        os.path.join(data_dir, filename)
+        for filename in os.listdir(data_dir)
+        if filename.endswith('.json')
+    )
+
+
+def init_worker(mongo_uri: str, mongo_db: str) -> None:
+    """
+    Open the worker process's MongoDB connection.
+
+    Args:
+        mongo_uri: MongoDB connection URI
+        mongo_db: MongoDB database name
+    """
+    global _worker_connector
+    _worker_connector = MongoDBConnector(uri=mongo_uri, db_name=mongo_db)
+    if not _worker_connector.connect():
+        logger.error("Worker failed to connect to MongoDB")
+
+
+def process_file(file_path: str) -> int:
+    """
+    Parse, clean and store the jobs from a single JSON file.
+
+    Runs inside a worker process, using the connection from init_worker.
+
+    Args:
+        file_path: Path to the JSON file
+
+    Returns:
+        int: Number of new jobs inserted
+    """
+    filename = os.path.basename(file_path)
+    source = filename.split('.')[0]
+
+    try:
+        with open(file_path, 'rb') as f:
+            data = orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError) as e:
+        logger.error(f"Could not read {filename}: {e}")
+        return 0
+
+    jobs = data.get('jobs', [])
+    if not jobs:
+        logger.warning(f"No jobs found in {filename}")
+        return 0
+
+    # Same field mapping and cleaning as the Scrapy crawl
+    spider = JobSpider(data_dir=os.path.dirname(file_path))
+    cleaner = JobDataCleaningPipeline()
+    documents = [
+        dict(cleaner.process_item(spider.process_job(job, source, index), spider))
+        for index, job in enumerate(jobs, start=1)
+    ]
+
+    # Retry the connection if it was down when the worker started
+    if _worker_connector.client is None and not _worker_connector.connect():
+        logger.error(f"Failed to connect to MongoDB while processing {filename}")
+        return 0
+
+    inserted = _worker_connector.bulk_upsert(
+        JobsMongoDBPipeline.collection_name,
+        documents,
+        JobsMongoDBPipeline.unique_keys
+    )
+    logger.info(f"Processed {len(documents)} jobs from {filename} ({inserted} new)")
+    return inserted
+
+
+def ensure_indexes(mongo_uri: str, mongo_db: str) -> bool:
+    """
+    Create the jobs collection indexes before the workers start.
+
+    Args:
+        mongo_uri: MongoDB connection URI
+        mongo_db: MongoDB database name
+
+    Returns:
+        bool: True if connected to MongoDB, False otherwise
+    """
+    mongo_connector = MongoDBConnector(uri=mongo_uri, db_name=mongo_db)
+    if not mongo_connector.connect():
+        return False
+
+    try:
+        collection = mongo_connector.get_collection(JobsMongoDBPipeline.collection_name)
+        collection.create_indexes(JobsMongoDBPipeline.indexes)
+    except Exception as e:
+        logger.warning(f"Could not create indexes: {e}")
+    finally:
+        # Close before forking so workers don't inherit this client
+        mongo_connector.close()
+
+    return True
+
+
+def main():
+    """Main function to ingest all JSON files in parallel."""
+    args = parse_args()
+
+    if not os.path.isdir(args.data_dir):
+        logger.error(f"Data directory doesn't exist: {args.data_dir}")
+        return
+
+    file_paths = find_files(args.data_dir)
+    if not file_paths:
+        logger.warning(f"No JSON files found in {args.data_dir}")
+        return
+
+    if not ensure_indexes(args.mongo_uri, args.mongo_db):
+        logger.error("Failed to connect to MongoDB")
+        return
+
+    workers = args.workers or min(len(file_paths), os.cpu_count() or 1)
+    logger.info(f"Ingesting {len(file_paths)} files with {workers} workers")
+
+    with Pool(workers, initializer=init_worker, initargs=(args.mongo_uri, args.mongo_db)) as pool:
+        inserted = pool.map(process_file, file_paths)
+
+    logger.info(f"Ingest completed: {sum(inserted)} new jobs")
+
+
+if __name__ == "__main__":
+    main()
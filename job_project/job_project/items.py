@@ -19,4 +19,9 @@ class JobItem(scrapy.Item):
     # Metadata fields
     source = scrapy.Field()          # Source website/platform
     scraped_at = scrapy.Field()      # Timestamp when this was scraped
-    raw_data = scrapy.Field()        # Raw data in case we need it later
\ No newline at end of file
+    raw_data = scrapy.Field()        # Raw data in case we need it later
+
+
+class BatchItem(scrapy.Item):
+    """Item wrapping a batch of JobItems so pipelines can process them in bulk."""
+    items = scrapy.Field()           # List of JobItem
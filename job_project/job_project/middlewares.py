@@ -4,10 +4,13 @@
 # https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
 from scrapy import signals
+from scrapy.exceptions import NotConfigured
 
 # useful for handling different item types with a single interface
 from itemadapter import is_item, ItemAdapter
 
+from job_project.items import BatchItem
+
 
 class JobProjectSpiderMiddleware:
     # Not all methods need to be defined. If a method is not defined,
@@ -101,3 +104,38 @@ class JobProjectDownloaderMiddleware:
 
     def spider_opened(self, spider):
         spider.logger.info("Spider opened: %s" % spider.name)
+
+
+class BatchingMiddleware:
+    """
+    Spider middleware that groups the items from each response into
+    BatchItems, so the item pipelines can process them in bulk.
+
+    Scrapy's own item stats count batches rather than jobs, so the
+    pipelines record per-job "jobs/..." stats. Feed exports would write
+    whole batches, so the middleware disables itself when any are set up.
+    """
+
+    def __init__(self, batch_size=500):
+        self.batch_size = batch_size
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        if crawler.settings.getdict("FEEDS"):
+            raise NotConfigured("Item batching is disabled while feed exports are configured")
+        return cls(batch_size=crawler.settings.getint("ITEM_BATCH_SIZE", 500))
+
+    def process_spider_output(self, response, result, spider):
+        # Requests pass straight through; items are held until a batch is
+        # full, and any remainder is flushed once the response is exhausted
+        batch = []
+        for i in result:
+            if is_item(i) and not isinstance(i, BatchItem):
+                batch.append(i)
+                if len(batch) >= self.batch_size:
+                    yield BatchItem(items=batch)
+                    batch = []
+            else:
+                yield i
+        if batch:
+            yield BatchItem(items=batch)
@@ -1,10 +1,41 @@
+import asyncio
 import logging
+import re
+import time
+from collections import deque
 from datetime import datetime
-from typing import Dict, Any
+from typing import Deque, Dict, Any, List, Set, Tuple
 
-from infra.mongodb_connector import MongoDBConnector
-from infra.redis_connector import RedisConnector
-from job_project.items import JobItem
+from pymongo import ASCENDING, IndexModel
+from scrapy import Item
+from scrapy.exceptions import DropItem
+from scrapy.utils.defer import deferred_from_coro
+
+from infra.mongodb_connector import CASE_INSENSITIVE, AsyncMongoDBConnector
+from infra.redis_connector import AsyncRedisConnector
+from job_project.items import BatchItem, JobItem
+
+
+# Runs of whitespace, collapsed to a single space when cleaning text
+_WS_RE = re.compile(r'\s+')
+
+# Common job type variations, matched in a single scan
+_JOB_TYPE_RE = re.compile(
+    r'(full[\s\-]?time|part[\s\-]?time|contract(?:or)?|temp(?:orary)?|intern(?:ship)?|freelance(?:r)?)',
+    re.I
+)
+_JOB_TYPE_MAP = {
+    'fulltime': 'Full-time',
+    'parttime': 'Part-time',
+    'contract': 'Contract',
+    'contractor': 'Contract',
+    'temp': 'Temporary',
+    'temporary': 'Temporary',
+    'intern': 'Internship',
+    'internship': 'Internship',
+    'freelance': 'Freelance',
+    'freelancer': 'Freelance',
+}
 
 
 class JobDataCleaningPipeline:
@@ -13,6 +44,14 @@ class JobDataCleaningPipeline:
     """
     def process_item(self, item: JobItem, spider) -> JobItem:
         """Clean and normalize job data."""
+        if isinstance(item, BatchItem):
+            for job_item in item['items']:
+                self._clean_item(job_item)
+            return item
+        return self._clean_item(item)
+    
+    def _clean_item(self, item: JobItem) -> JobItem:
+        """Clean and normalize a single job item in place."""
         # Clean job title
         if 'title' in item:
             item['title'] = self._clean_text(item['title'])
@@ -47,31 +86,18 @@ class JobDataCleaningPipeline:
         if not text:
             return ""
             
-        # Convert to string if not already
-        text = str(text)
-        
-        # Remove extra whitespace
-        text = ' '.join(text.split())
-        
-        return text.strip()
+        # Collapse whitespace in one pass, converting to string if not already
+        return _WS_RE.sub(' ', str(text)).strip()
     
     def _normalize_job_type(self, job_type: str) -> str:
         """Normalize job type to standard values."""
-        job_type = self._clean_text(job_type).lower()
+        job_type = self._clean_text(job_type)
         
         # Map common variations to standard types
-        if any(term in job_type for term in ['full time', 'full-time', 'fulltime']):
-            return 'Full-time'
-        elif any(term in job_type for term in ['part time', 'part-time', 'parttime']):
-            return 'Part-time'
-        elif any(term in job_type for term in ['contract', 'contractor']):
-            return 'Contract'
-        elif any(term in job_type for term in ['temp', 'temporary']):
-            return 'Temporary'
-        elif any(term in job_type for term in ['intern', 'internship']):
-            return 'Internship'
-        elif any(term in job_type for term in ['freelance', 'freelancer']):
-            return 'Freelance'
+        match = _JOB_TYPE_RE.search(job_type)
+        if match:
+            key = match.group(1).lower().replace(' ', '').replace('-', '')
+            return _JOB_TYPE_MAP[key]
         
         # If we can't normalize, return the original
         return job_type.capitalize()
@@ -80,88 +106,257 @@ class JobDataCleaningPipeline:
 class JobRedisDedupePipeline:
     """
     Pipeline for deduplicating job items using Redis.
+    
+    Recently seen jobs are also kept in a bounded in-process cache so that
+    repeats are dropped without a Redis round trip.
     """
-    def __init__(self, redis_url=None):
-        self.redis_connector = RedisConnector(url=redis_url)
+    local_cache_size = 100_000
+    
+    def __init__(self, redis_url=None, redis_pool_size=None):
+        self.redis_connector = AsyncRedisConnector(url=redis_url, pool_size=redis_pool_size)
         self.logger = logging.getLogger(__name__)
+        # Insertion order for eviction, plus a set for O(1) lookups
+        self._local: Deque[Tuple[str, str]] = deque()
+        self._local_set: Set[Tuple[str, str]] = set()
+        # Redis set name per source, built once rather than per item
+        self._key_cache: Dict[str, str] = {}
+        self.crawler = None
     
     @classmethod
     def from_crawler(cls, crawler):
-        return cls(
-            redis_url=crawler.settings.get('REDIS_URL')
+        pipeline = cls(
+            redis_url=crawler.settings.get('REDIS_URL'),
+            redis_pool_size=crawler.settings.getint('REDIS_POOL_SIZE')
         )
+        pipeline.crawler = crawler
+        return pipeline
     
     def open_spider(self, spider):
         """Connect to Redis when spider starts."""
-        if not self.redis_connector.connect():
-            self.logger.error("Failed to connect to Redis")
+        # Scrapy only awaits Deferreds from open_spider/close_spider
+        return deferred_from_coro(self._open())
     
     def close_spider(self, spider):
         """Close Redis connection when spider finishes."""
-        self.redis_connector.close()
+        return deferred_from_coro(self.redis_connector.close())
     
-    def process_item(self, item: JobItem, spider) -> JobItem:
-        """Check if job has been seen before and mark as processed."""
+    async def _open(self) -> None:
+        if not await self.redis_connector.connect():
+            self.logger.error("Failed to connect to Redis")
+            return
+        await self.redis_connector.load_scripts()
+    
+    async def process_item(self, item: JobItem, spider) -> JobItem:
+        """Mark job as processed, dropping it if it has been seen before."""
+        if isinstance(item, BatchItem):
+            return await self._process_batch(item)
+        
         # Skip if job_id or source is missing
         if 'job_id' not in item or 'source' not in item:
             return item
         
-        # Check if job has been seen before
-        job_id = str(item['job_id'])
-        source = str(item['source'])
+        # JobSpider.process_job already sets both as strings
+        job_id = item['job_id']
+        source = item['source']
         
-        if self.redis_connector.is_in_set(f"scraped_jobs:{source}", job_id):
+        if (source, job_id) in self._local_set:
             self.logger.debug(f"Job already processed: {job_id} from {source}")
-        else:
-            # Mark job as seen
-            self.redis_connector.add_to_set(f"scraped_jobs:{source}", job_id)
+            self._count_dropped(1)
+            raise DropItem(f"Duplicate job: {job_id} from {source}")
+        
+        # One server-side script both checks and marks the job atomically,
+        # recording when it was first seen
+        added = await self.redis_connector.mark_seen(
+            self._dedupe_set(source), job_id, int(time.time())
+        )
+        if added is None:
+            # Redis is unavailable, so let the job through rather than
+            # treating it as a duplicate; the unique index still applies
+            self.logger.warning(f"Could not check job {job_id} from {source} in Redis, passing it through")
+            return item
+        
+        # Only cache jobs Redis has answered for, so a failed call can't
+        # poison the local cache
+        self._remember(source, job_id)
+        if not added:
+            self.logger.debug(f"Job already processed: {job_id} from {source}")
+            self._count_dropped(1)
+            raise DropItem(f"Duplicate job: {job_id} from {source}")
         
         return item
+    
+    async def _process_batch(self, batch: BatchItem) -> BatchItem:
+        """Remove already-seen jobs from a batch, checking Redis in one round trip."""
+        keep = []
+        to_check = []
+        for job_item in batch['items']:
+            # Jobs missing job_id or source pass through unchecked
+            if 'job_id' not in job_item or 'source' not in job_item:
+                keep.append(True)
+                continue
+            key = (job_item['source'], job_item['job_id'])
+            if key in self._local_set:
+                keep.append(False)
+            else:
+                keep.append(True)
+                to_check.append((len(keep) - 1, key))
+        
+        added = await self.redis_connector.mark_seen_many(
+            [(self._dedupe_set(source), job_id) for _, (source, job_id) in to_check],
+            int(time.time())
+        )
+        if added is None:
+            # Redis is unavailable, so keep the unchecked jobs (and leave them
+            # out of the local cache) rather than treating them as duplicates
+            self.logger.warning(f"Could not check {len(to_check)} jobs in Redis, passing them through")
+            added = []
+        
+        for (index, (source, job_id)), is_new in zip(to_check, added):
+            self._remember(source, job_id)
+            keep[index] = is_new
+        
+        batch['items'] = [job_item for job_item, kept in zip(batch['items'], keep) if kept]
+        dropped = len(keep) - len(batch['items'])
+        self._count_dropped(dropped)
+        if not batch['items']:
+            raise DropItem("All jobs in batch already processed")
+        
+        if dropped:
+            self.logger.debug(f"Dropped {dropped} already processed jobs from batch")
+        return batch
+    
+    def _count_dropped(self, count: int) -> None:
+        """Record dropped duplicates per job, since Scrapy's own stats count batches."""
+        if count and self.crawler is not None:
+            self.crawler.stats.inc_value('jobs/dropped', count)
+    
+    def _dedupe_set(self, source: str) -> str:
+        """Name of the Redis set holding seen job IDs for a source."""
+        key = self._key_cache.get(source)
+        if key is None:
+            key = self._key_cache[source] = f"scraped_jobs:{source}"
+        return key
+    
+    def _remember(self, source: str, job_id: str) -> None:
+        """Add a job to the local cache, evicting the oldest entry when full."""
+        key = (source, job_id)
+        if key in self._local_set:
+            return
+        if len(self._local) >= self.local_cache_size:
+            self._local_set.discard(self._local.popleft())
+        self._local.append(key)
+        self._local_set.add(key)
 
 
 class JobsMongoDBPipeline:
     """
     Pipeline for storing job items in MongoDB.
+    
+    Items are buffered and written with a single bulk upsert per batch.
+    Full batches are flushed in the background so item processing is not
+    held up by the write. BatchItems from BatchingMiddleware are upserted
+    directly.
+    
+    By the time a job reaches this pipeline it has already been marked as
+    seen in Redis, so a later run would drop it. The crawl is therefore
+    stopped rather than carrying on when MongoDB cannot be written to.
     """
     collection_name = 'jobs'
+    # Use job_id and source as unique keys to avoid duplicates
+    unique_keys = ['job_id', 'source']
+    # Fields query.py filters on, indexed case-insensitively
+    filter_fields = ['company', 'job_type', 'location']
+    indexes = [
+        IndexModel([(key, ASCENDING) for key in unique_keys], unique=True, background=True),
+    ] + [
+        IndexModel([(field, ASCENDING)], collation=CASE_INSENSITIVE, background=True)
+        for field in filter_fields
+    ]
+    batch_size = 500
     
     def __init__(self, mongo_uri=None, mongo_db=None):
-        self.mongo_connector = MongoDBConnector(uri=mongo_uri, db_name=mongo_db)
+        self.mongo_connector = AsyncMongoDBConnector(uri=mongo_uri, db_name=mongo_db)
         self.logger = logging.getLogger(__name__)
+        self._buffer: List[Dict] = []
+        self._pending: Set[asyncio.Task] = set()
+        self.crawler = None
     
     @classmethod
     def from_crawler(cls, crawler):
-        return cls(
+        pipeline = cls(
             mongo_uri=crawler.settings.get('MONGO_URI'),
             mongo_db=crawler.settings.get('MONGO_DATABASE')
         )
+        pipeline.crawler = crawler
+        return pipeline
     
     def open_spider(self, spider):
-        """Connect to MongoDB when spider starts."""
-        if not self.mongo_connector.connect():
-            self.logger.error("Failed to connect to MongoDB")
+        """Connect to MongoDB and ensure the unique index when spider starts."""
+        # Scrapy only awaits Deferreds from open_spider/close_spider
+        return deferred_from_coro(self._open())
     
     def close_spider(self, spider):
-        """Close MongoDB connection when spider finishes."""
+        """Flush pending items and close MongoDB connection when spider finishes."""
+        return deferred_from_coro(self._close())
+    
+    async def _open(self) -> None:
+        if not await self.mongo_connector.connect():
+            # Fail the crawl before any job is marked as seen in Redis
+            raise RuntimeError("Failed to connect to MongoDB")
+        
+        # Create the indexes once per crawl rather than on every insert
+        collection = self.mongo_connector.get_collection(self.collection_name)
+        try:
+            await collection.create_indexes(self.indexes)
+        except Exception as e:
+            self.logger.warning(f"Could not create indexes: {e}")
+    
+    async def _close(self) -> None:
+        # Write the remainder alongside any flushes still in flight
+        buffer, self._buffer = self._buffer, []
+        await asyncio.gather(*self._pending, self._flush(buffer))
         self.mongo_connector.close()
     
-    def process_item(self, item: JobItem, spider) -> JobItem:
-        """Process and store job item in MongoDB."""
+    async def process_item(self, item: JobItem, spider) -> JobItem:
+        """Process and buffer job item for storage in MongoDB."""
+        if isinstance(item, BatchItem):
+            # Already batched upstream, so write it straight away
+            self._count_scraped(len(item['items']))
+            await self._flush([self._to_document(job_item) for job_item in item['items']])
+            return item
+        
+        self._count_scraped(1)
+        self._buffer.append(self._to_document(item))
+        if len(self._buffer) >= self.batch_size:
+            buffer, self._buffer = self._buffer, []
+            task = asyncio.ensure_future(self._flush(buffer))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+        
+        return item
+    
+    def _count_scraped(self, count: int) -> None:
+        """Record jobs reaching storage, since Scrapy's own stats count batches."""
+        if self.crawler is not None:
+            self.crawler.stats.inc_value('jobs/scraped', count)
+    
+    def _to_document(self, item: JobItem) -> Dict:
+        """Turn a job item into the document to store."""
         # Add timestamp if not present
         if 'scraped_at' not in item:
             item['scraped_at'] = datetime.utcnow()
         
-        # Create document from item
-        doc = dict(item)
-        
-        # Use job_id and source as unique keys to avoid duplicates
-        unique_keys = ['job_id', 'source']
-        
-        # Insert into MongoDB
-        self.mongo_connector.insert_one(
-            self.collection_name,
-            doc,
-            unique_keys=unique_keys if all(key in doc for key in unique_keys) else None
-        )
-        
-        return item
\ No newline at end of file
+        # Use the item's own field dict as the document rather than copying
+        # it; job_id and source are always set by the spider and the unique
+        # index from open_spider enforces them
+        return item._values if isinstance(item, Item) else dict(item)
+    
+    async def _flush(self, documents: List[Dict]) -> None:
+        """Write a batch of documents in one bulk upsert, stopping the crawl if it fails."""
+        inserted = await self.mongo_connector.bulk_upsert(self.collection_name, documents, self.unique_keys)
+        if inserted is None:
+            self.logger.error(
+                f"Failed to store {len(documents)} jobs, which may already be marked as seen in Redis"
+            )
+            if self.crawler is not None and self.crawler.engine is not None:
+                self.crawler.engine.close_spider(self.crawler.spider, 'mongodb_write_failed')
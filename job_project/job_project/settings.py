@@ -101,6 +101,15 @@ ROBOTSTXT_OBEY = False
 # Configure maximum concurrent requests
 CONCURRENT_REQUESTS = 4
 
+# Group items into BatchItems so pipelines can write them in bulk. Scrapy's
+# item_scraped_count/item_dropped_count then count batches; per-job counts
+# are in the jobs/scraped and jobs/dropped stats. Batching is switched off
+# automatically when feed exports (e.g. -o out.json) are configured.
+SPIDER_MIDDLEWARES = {
+    'job_project.middlewares.BatchingMiddleware': 800,
+}
+ITEM_BATCH_SIZE = 500
+
 # Configure item pipelines - these can be overridden in the spider's custom_settings
 ITEM_PIPELINES = {
     'job_project.pipelines.JobDataCleaningPipeline': 300,
@@ -114,6 +123,7 @@ MONGO_DATABASE = os.environ.get('MONGO_DATABASE', 'jobs_data')
 
 # Redis settings (from environment or defaults)
 REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+REDIS_POOL_SIZE = int(os.environ.get('REDIS_POOL_SIZE', '8'))
 
 # Path to data directory for JSON files
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
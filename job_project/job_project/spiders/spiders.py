@@ -1,8 +1,9 @@
-import json
+import io
 import os
 import logging
 from datetime import datetime
 
+import ijson
 import scrapy
 from scrapy.http import Request
 from job_project.items import JobItem
@@ -47,36 +48,46 @@ class JobSpider(scrapy.Spider):
         """Parse JSON data from response."""
         filename = response.meta['filename']
         source = os.path.basename(filename).split('.')[0]
+        count = 0
         
         try:
-            # Parse JSON data
-            data = json.loads(response.text)
-            jobs = data.get('jobs', [])
-            
-            if not jobs:
-                self._logger.warning(f"No jobs found in {filename}")
-                return
-                
-            self._logger.info(f"Found {len(jobs)} jobs in {filename}")
+            # Stream jobs one at a time instead of materializing the whole
+            # document; floats stay floats so items remain BSON-encodable
+            jobs = ijson.items(io.BytesIO(response.body), 'jobs.item', use_float=True)
             
             # Process each job
             for job in jobs:
-                job_item = self.process_job(job, source)
+                count += 1
+                job_item = self.process_job(job, source, count)
                 yield job_item
+            
+            if not count:
+                self._logger.warning(f"No jobs found in {filename}")
+                return
                 
+            self._logger.info(f"Processed {count} jobs from {filename}")
             self.files_processed += 1
             
-        except json.JSONDecodeError:
-            self._logger.error(f"Invalid JSON in file: {filename}")
+        except ijson.JSONError:
+            # Jobs parsed before the malformed point have already been yielded
+            self._logger.error(
+                f"Invalid JSON in file: {filename} after {count} jobs; those jobs were still processed"
+            )
         except Exception as e:
             self._logger.error(f"Error processing {filename}: {e}")
     
-    def process_job(self, job_data, source):
-        """Process a single job entry from the JSON data."""
+    def process_job(self, job_data, source, index):
+        """
+        Process a single job entry from the JSON data.
+        
+        Jobs without an id fall back to "<source>_<index>", where index is the
+        job's 1-based position in its file, so the ID does not depend on the
+        order files are processed in.
+        """
         self.items_processed += 1
         
         job_item = JobItem()
-        job_item['job_id'] = str(job_data.get('id', f"{source}_{self.items_processed}"))
+        job_item['job_id'] = str(job_data.get('id', f"{source}_{index}"))
         job_item['title'] = job_data.get('title', '')
         job_item['company'] = job_data.get('company', {}).get('name', '')
         job_item['url'] = job_data.get('url', '')
@@ -9,14 +9,20 @@ This script:
 """
 
 import os
+import sys
 import csv
 import logging
 import argparse
-from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
-# Import our infrastructure connectors
-from infra.mongodb_connector import MongoDBConnector
+import orjson
+
+# Make the Scrapy project package importable when run from the project root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'job_project'))
+
+# Import our infrastructure connectors and the job schema
+from infra.mongodb_connector import CASE_INSENSITIVE, MongoDBConnector
+from job_project.items import JobItem
 
 # Configure logging
 logging.basicConfig(
@@ -27,6 +33,38 @@ logging.basicConfig(
 
 logger = logging.getLogger('query')
 
+# CSV columns, fixed by the JobItem schema: the common fields first, then
+# the remaining item fields, with anything unexpected collected in 'extras'
+LEADING_FIELDS = [
+    'job_id', 'title', 'company', 'location', 'job_type',
+    'salary', 'url', 'source', 'scraped_at'
+]
+FIELDNAMES = LEADING_FIELDS + sorted(set(JobItem.fields) - set(LEADING_FIELDS)) + ['_id']
+FIELDNAMES_SET = frozenset(FIELDNAMES)
+EXTRAS_FIELD = 'extras'
+
+# Server-side formatting producing CSV-ready values: datetimes as ISO
+# strings, skills joined with commas and ObjectIds as strings
+CSV_FORMATTING = {
+    '_id': {'$toString': '$_id'},
+    'scraped_at': {
+        '$dateToString': {'date': '$scraped_at', 'format': '%Y-%m-%dT%H:%M:%S.%LZ'}
+    },
+    'skills': {
+        '$reduce': {
+            'input': '$skills',
+            'initialValue': '',
+            'in': {
+                '$concat': [
+                    '$$value',
+                    {'$cond': [{'$eq': ['$$value', '']}, '', ', ']},
+                    '$$this'
+                ]
+            }
+        }
+    },
+}
+
 
 def parse_args():
     """Parse command line arguments."""
@@ -39,13 +77,13 @@ def parse_args():
                         help='Maximum number of results to return (0 for all)')
     
     parser.add_argument('--company', type=str, default=None,
-                        help='Filter by company name (case insensitive)')
+                        help='Filter by exact company name (case insensitive)')
     
     parser.add_argument('--job-type', type=str, default=None,
-                        help='Filter by job type (e.g., Full-time, Contract)')
+                        help='Filter by exact job type (e.g., Full-time, Contract)')
     
     parser.add_argument('--location', type=str, default=None,
-                        help='Filter by location (case insensitive)')
+                        help='Filter by exact location (case insensitive)')
     
     parser.add_argument('--mongo-uri', type=str, 
                         default=os.environ.get('MONGO_URI', 'mongodb://mongodb:27017/'),
@@ -70,74 +108,106 @@ def build_query(args) -> Dict:
     """
     query = {}
     
+    # Plain equality filters so the case-insensitive collation indexes can be
+    # used; the query must be run with the CASE_INSENSITIVE collation
+    
     # Filter by company
     if args.company:
-        query['company'] = {'$regex': args.company, '$options': 'i'}
+        query['company'] = args.company
     
     # Filter by job type
     if args.job_type:
-        query['job_type'] = {'$regex': args.job_type, '$options': 'i'}
+        query['job_type'] = args.job_type
     
     # Filter by location
     if args.location:
-        query['location'] = {'$regex': args.location, '$options': 'i'}
+        query['location'] = args.location
     
     return query
 
 
-def export_to_csv(data: List[Dict], output_path: str) -> bool:
+def build_pipeline(query: Dict, limit: int = 0) -> List[Dict]:
+    """
+    Build the aggregation pipeline that filters jobs and shapes CSV rows.
+    
+    Args:
+        query: MongoDB query
+        limit: Maximum number of results (0 for all)
+        
+    Returns:
+        List[Dict]: Aggregation stages
+    """
+    pipeline = [{'$match': query}]
+    
+    # Limit before formatting so only the returned documents are reshaped
+    if limit > 0:
+        pipeline.append({'$limit': limit})
+    
+    # Fields outside the schema are kept so they can go into the extras column
+    pipeline.append({'$addFields': CSV_FORMATTING})
+    return pipeline
+
+
+def to_csv_row(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fit a job document to the fixed CSV columns.
+    
+    Args:
+        doc: Job document with CSV-ready values
+        
+    Returns:
+        Dict: Row with any fields outside FIELDNAMES serialized as JSON in 'extras'
+    """
+    extras = {key: value for key, value in doc.items() if key not in FIELDNAMES_SET}
+    if not extras:
+        return doc
+    
+    row = {key: value for key, value in doc.items() if key in FIELDNAMES_SET}
+    row[EXTRAS_FIELD] = orjson.dumps(extras, default=str).decode()
+    return row
+
+
+def export_to_csv(data: Iterable[Dict], output_path: str) -> Optional[int]:
     """
     Export job data to CSV file.
     
+    Documents are written in a single pass as they are read, so the full
+    result set is never held in memory. Values are expected to be already
+    formatted for CSV (see CSV_FORMATTING).
+    
     Args:
-        data: List of job documents
+        data: Iterable of job documents
         output_path: Path to output CSV file
         
     Returns:
-        bool: True if export was successful, False otherwise
+        Optional[int]: Number of records exported, or None if reading the
+        data or writing the file failed
     """
-    if not data:
-        logger.warning("No data to export")
-        return False
-    
+    count = 0
     try:
-        # Determine CSV fieldnames (columns)
-        # Start with common fields in a specific order
-        fieldnames = [
-            'job_id', 'title', 'company', 'location', 'job_type',
-            'salary', 'url', 'source', 'scraped_at'
-        ]
-        
-        # Add any additional fields found in the data
-        for doc in data:
-            for key in doc.keys():
-                if key not in fieldnames:
-                    fieldnames.append(key)
+        data = iter(data)
+        first = next(data, None)
+        if first is None:
+            logger.warning("No data to export")
+            return 0
         
         # Write to CSV
         with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            writer = csv.DictWriter(csvfile, fieldnames=FIELDNAMES + [EXTRAS_FIELD])
             writer.writeheader()
             
+            writer.writerow(to_csv_row(first))
+            count += 1
             for doc in data:
-                # Process any special fields
-                row = doc.copy()
-                
-                # Handle lists (e.g., skills) by joining with commas
-                for key, value in row.items():
-                    if isinstance(value, list):
-                        row[key] = ', '.join(str(item) for item in value)
-                    elif isinstance(value, datetime):
-                        row[key] = value.isoformat()
-                
-                writer.writerow(row)
+                writer.writerow(to_csv_row(doc))
+                count += 1
         
-        logger.info(f"Exported {len(data)} records to {output_path}")
-        return True
+        logger.info(f"Exported {count} records to {output_path}")
+        return count
     
     except Exception as e:
-        logger.error(f"Error exporting to CSV: {e}")
-        return False
+        logger.error(f"Error exporting to CSV after {count} records: {e}")
+        return None
 
 
 def main():
@@ -158,20 +228,19 @@ def main():
         collection_name = 'jobs'
         logger.info(f"Executing query: {query}")
         
-        # Use the find method from our MongoDB connector
+        # Stream CSV-shaped rows from our MongoDB connector straight into the CSV
         # This demonstrates using reusable queries
-        jobs_data = mongo_connector.find(
+        jobs_data = mongo_connector.iter_aggregate(
             collection_name=collection_name,
-            query=query,
-            limit=args.limit
+            pipeline=build_pipeline(query, args.limit),
+            collation=CASE_INSENSITIVE
         )
         
-        # Log result count
-        logger.info(f"Query returned {len(jobs_data)} results")
-        
         # Export to CSV
-        if jobs_data:
-            export_to_csv(jobs_data, args.output)
+        exported = export_to_csv(jobs_data, args.output)
+        if exported is None:
+            logger.error(f"Export to {args.output} failed")
+        elif exported:
             logger.info(f"Data successfully exported to {args.output}")
         else:
             logger.warning("No data found matching the query criteria")